@@ -0,0 +1,199 @@
+"""Functions that the tutorial notebooks run on all of your computer's processors at once.
+
+When a notebook hands work to a ProcessPoolExecutor, every worker process has to be
+able to find the function it's running. On Linux, the workers start out as copies of
+your notebook, so a function you defined in a notebook cell works fine. But on macOS
+and Windows, each worker starts fresh and *imports* the function by name, and it can't
+import anything that was only defined inside a notebook. Keeping these functions in
+this file, in the same folder as the notebooks, means they work everywhere.
+"""
+import os
+import xml.parsers.expat
+from collections import Counter
+
+from lxml import etree
+
+
+# Used in the XML tutorial (ep_xml.ipynb)
+
+W_TAG = "{http://www.tei-c.org/ns/1.0}w" # The full name of a <w> tag, with its namespace
+# Don't collect IDs, drop the whitespace that's only there for indentation,
+# and don't look up entities or anything on the network
+PARSER_OPTIONS = dict(collect_ids=False, huge_tree=True, remove_blank_text=True, resolve_entities=False, no_network=True)
+
+class NounCounter:
+    """A parser target that counts regularized nouns without building a tree."""
+    def __init__(self):
+        self.counts = Counter()
+        self.in_noun = False # Are you inside a noun's <w> tag right now?
+        self.reg = None
+        self.text = []
+
+    def start(self, tag, attrib):
+        # When a noun begins, note its regularized spelling, if it has one
+        if tag == W_TAG and attrib.get('pos', '').startswith('n'):
+            self.in_noun = True
+            self.reg = attrib.get('reg')
+            self.text = []
+
+    def data(self, data):
+        # The parser may hand you a word's text in more than one piece
+        if self.in_noun:
+            self.text.append(data)
+
+    def end(self, tag):
+        # When a noun ends, count its regularized spelling (or its original text)
+        if tag == W_TAG and self.in_noun:
+            self.counts[self.reg if self.reg is not None else ''.join(self.text)] += 1
+            self.in_noun = False
+
+    def close(self):
+        return self.counts
+
+def count_nouns(path):
+    """Count the regularized nouns in one XML file."""
+    parser = etree.XMLParser(target=NounCounter(), **PARSER_OPTIONS)
+    return etree.parse(path, parser) # Returns the Counter from NounCounter.close()
+
+
+# Used in the Metadata tutorial (metadata.ipynb)
+
+# Every filename is a TCP ID followed by this ending
+SUFFIX_LEN = len("_header.xml")
+
+class HeaderReader:
+    """Collects the title, author, date, and printers from one metadata file, without building a tree."""
+    def __init__(self):
+        self.record = {} # Empty dictionary for this file's title, author, and date
+        self.printers = [] # Empty list for this file's printers
+        self.stack = [] # The tags you're inside of right now
+        self.in_source = False # Are you inside <sourceDesc>?
+        self.field = None # Which field's text are you collecting right now?
+        self.depth = 0
+        self.text = []
+
+    def start(self, tag, attrib):
+        # Like .text in lxml, only keep the text that comes before a field's first child tag
+        if self.field is not None:
+            self.finish()
+        parent = self.stack[-1] if self.stack else None
+        # Mark a printer's <person> tag so we can recognize the <persName> inside it
+        self.stack.append("printer" if tag == "person" and attrib.get("type") == "printer" else tag)
+
+        if tag == "sourceDesc":
+            self.in_source = True
+        # Get the first title and author (if there are any) inside <sourceDesc>
+        elif self.in_source and tag in ("title", "author") and tag not in self.record:
+            self.field, self.depth, self.text = tag, len(self.stack), []
+        # Get the first date (if there is one) inside <sourceDesc>
+        elif self.in_source and tag == "date" and "date" not in self.record:
+            self.record["date"] = attrib.get("when")
+        # Get every printer's name, from a <persName> inside <person type="printer">
+        elif tag == "persName" and parent == "printer":
+            self.field, self.depth, self.text = "printer", len(self.stack), []
+
+    def data(self, data):
+        # The parser may hand you a field's text in more than one piece
+        if self.field is not None:
+            self.text.append(data)
+
+    def end(self, tag):
+        if self.field is not None and len(self.stack) == self.depth:
+            self.finish()
+        if tag == "sourceDesc":
+            self.in_source = False
+        self.stack.pop()
+
+    def finish(self):
+        text = "".join(self.text) or None
+        if self.field == "printer":
+            self.printers.append(text)
+        else:
+            self.record[self.field] = text
+        self.field = None
+
+def extract_record(f):
+    """Get the TCP ID, title, author, date, and printers from one metadata file."""
+    tcp_id = os.path.basename(f)[:-SUFFIX_LEN] # Get TCP ID from filename
+
+    # Hook our reader up to Python's built-in expat parser, which calls its methods
+    # as it reads each opening tag, piece of text, and closing tag
+    # (Our metadata files use TEI as their default namespace, so tags come through without a prefix)
+    reader = HeaderReader()
+    p = xml.parsers.expat.ParserCreate()
+    p.StartElementHandler = reader.start
+    p.CharacterDataHandler = reader.data
+    p.EndElementHandler = reader.end
+
+    # Read the whole (small) file in one go, and parse it
+    with open(f, "rb") as fp:
+        p.Parse(fp.read(), True)
+
+    return tcp_id, reader.record.get('title'), reader.record.get('author'), reader.record.get('date'), reader.printers
+
+
+# Used in the Tf-Idf and Similarity tutorials (tf_idf.ipynb and similarity.ipynb)
+
+def tokenize(f, attribute='reg'):
+    """Get the file key and a count of each word in one text, by its regularized ('reg') or lemmatized ('lemma') form."""
+    filekey = os.path.basename(f).partition(".")[0] # The part of the filename before the "."
+    # Rather than parsing each whole file into an XML tree, you can "stream" through it,
+    # stopping only at the w tags. (Skipping XML IDs makes this even faster.)
+    context = etree.iterparse(f, events=('end',), tag='{*}w', collect_ids=False)
+
+    counts = Counter() # Count this text's words as you go, rather than saving them all in a list
+    lowered = {} # The lowercase version of each form you've already seen
+    for _, word in context:
+        # For each word, you'll do several things at once:
+        # 1. Make sure the tag has a word at all: if word.text != None
+        # 2. Get the form of the word you asked for: word.get(attribute, word.text)
+        # 3. Make sure all the words are in lowercase: .lower()
+        if word.text != None:
+            form = word.get(attribute, word.text)
+            # The same forms come up again and again, so only lowercase each one once
+            lower = lowered.get(form)
+            if lower is None:
+                lower = lowered[form] = form.lower()
+            counts[lower] += 1
+        # Free the memory for this tag and any tags before it
+        word.clear()
+        while word.getprevious() is not None:
+            del word.getparent()[0]
+    return filekey, counts
+
+
+# Used in the Word2Vec tutorial (word2vec.ipynb)
+
+def get_sentences(filename):
+    """Yield the lemmas in each sentence of an XML file, one sentence at a time."""
+    new_sentence = [] # An empty list for the first sentence
+    lowered = {} # The lowercase version of each lemma you've already seen
+    # Rather than parsing the whole file into a tree, "stream" through it, stopping only at the w tags
+    for _, word in etree.iterparse(filename, events=('end',), tag='{*}w', collect_ids=False, huge_tree=True):
+        # A <pc unit="sentence"> tag just before this word means a new sentence is starting
+        previous = word.getprevious()
+        if previous is not None and previous.get('unit') == 'sentence':
+            yield new_sentence
+            new_sentence = []
+        # Use the word's lemma, and only look at its text if it doesn't have one
+        lemma = word.get('lemma')
+        if lemma is None:
+            lemma = word.text
+        if lemma is not None:
+            # The same lemmas come up again and again, so only lowercase each one once,
+            # and reuse that same string every time instead of making a new copy
+            lower = lowered.get(lemma)
+            if lower is None:
+                lower = lowered[lemma] = lemma.lower()
+            new_sentence.append(lower)
+        # Free the memory for this tag and any tags before it
+        word.clear()
+        while word.getprevious() is not None:
+            del word.getparent()[0]
+    # Don't forget the last sentence in the file!
+    if new_sentence:
+        yield new_sentence
+
+def parse_file(filename):
+    """Get a list of every sentence in one file."""
+    return list(get_sentences(filename))